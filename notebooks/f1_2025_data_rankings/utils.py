@@ -12,30 +12,36 @@ def replace_constructors_names(df_features: pd.DataFrame) -> pd.DataFrame:
     """
     Replaces constructor names with abbreviations.
     """
-    df_features['constructor_name'] = df_features['constructor_name'].replace(JOLPICA_CONSTRUCTOR_RENAME)
+    constructor_names = df_features['constructor_name']
+    # map is a plain dict lookup (replace goes through the generic regex/list machinery);
+    # names without an abbreviation come back as NaN and are restored by fillna.
+    df_features['constructor_name'] = constructor_names.map(JOLPICA_CONSTRUCTOR_RENAME).fillna(constructor_names)
     return df_features
 
 
+NON_FEATURE_COLUMNS = pd.Index([
+    "driver_id",
+    "year",
+    "driver_full_name",
+    "driver_surname",
+    "constructor_name"
+])
+
+
 def get_features_column_list(df_features: pd.DataFrame) -> list[str]:
     """
-    Returns a list of feature column names from a DataFrame.
+    Returns a list of feature column names from a DataFrame (in their original order).
     """
-
-    list_non_feature_columns = [
-        "driver_id",
-        "year",
-        "driver_full_name",
-        "driver_surname",
-        "constructor_name"
-    ]
-    return [col for col in df_features.columns if col not in list_non_feature_columns]
+    return df_features.columns.difference(NON_FEATURE_COLUMNS, sort=False).tolist()
 
 
-def create_normalized_features(df_features: pd.DataFrame, min_val: float = 5, max_val: float = 10, normalizer: FeatureNormalizer = FeatureNormalizer()) -> pd.DataFrame:
+def create_normalized_features(df_features: pd.DataFrame, min_val: float = 5, max_val: float = 10, normalizer: FeatureNormalizer | None = None) -> pd.DataFrame:
     """
     Creates normalized features from a DataFrame.
     """
-    df_normalized = df_features.copy()
-    for col in get_features_column_list(df_features):
-        df_normalized[f'{col}_norm'] = normalizer.robust_normalize(df_features[col], target_range=(min_val, max_val))
-    return df_normalized
\ No newline at end of file
+    if normalizer is None:
+        normalizer = FeatureNormalizer()
+    feature_columns = get_features_column_list(df_features)
+    df_norm = normalizer.robust_normalize_frame(df_features[feature_columns], target_range=(min_val, max_val)).add_suffix('_norm')
+    # copy=False shares the original blocks instead of duplicating the whole feature frame
+    return pd.concat([df_features, df_norm], axis=1, copy=False)
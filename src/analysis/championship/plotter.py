@@ -1,4 +1,5 @@
 from matplotlib import patches
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -51,14 +52,14 @@ def plot_wcc(
     """
     
     # 1. Filtragem e Preparação dos Dados
-    df_plot = df_campeonato[df_campeonato['year'] == ano].copy()
+    df_plot = df_campeonato[df_campeonato['year'] == ano]
     
     if df_plot.empty:
         print(f"Nenhum dado encontrado para o ano {ano}.")
         return
 
     # Garante que os rounds estejam em ordem crescente (a query original estava DESC)
-    df_plot.sort_values(by='round_id', ascending=True, inplace=True)
+    df_plot = df_plot.sort_values(by='round_id', ascending=True)
 
     # 2. Configuração Visual (Cores das Equipes)
     # Hex codes aproximados para a temporada 2024/2025
@@ -97,6 +98,7 @@ def plot_wcc(
         palette=cores_times,
         marker='o', # Bolinha em cada corrida
         linewidth=2.5, # Linha um pouco mais grossa para visibilidade
+        estimator=None, # Já é um ponto por equipe/corrida: desliga a agregação (média + intervalo de confiança) do Seaborn
         ax=ax
     )
 
@@ -168,14 +170,14 @@ def plot_wdc(
     """
     
     # 1. Preparação dos Dados
-    df_plot = df_campeonato[df_campeonato['year'] == ano].copy()
+    df_plot = df_campeonato[df_campeonato['year'] == ano]
     
     if df_plot.empty:
         print(f"Nenhum dado encontrado para o ano {ano}.")
         return
 
     # Garante ordem cronológica (a query original vem DESC)
-    df_plot.sort_values(by='round_id', ascending=True, inplace=True)
+    df_plot = df_plot.sort_values(by='round_id', ascending=True)
 
     # 2. Filtragem de Pilotos
     # Se o usuário não passar lista, pegamos automaticamente os top 5 da última rodada
@@ -231,6 +233,7 @@ def plot_wdc(
         dashes=True, # Permite linhas tracejadas automáticas
         linewidth=3,
         markersize=8,
+        estimator=None, # Já é um ponto por piloto/corrida: desliga a agregação (média + intervalo de confiança) do Seaborn
         ax=ax
     )
 
@@ -249,10 +252,10 @@ def plot_wdc(
     ax.legend(title='Driver', bbox_to_anchor=(1.01, 1), loc='upper left', borderaxespad=0, frameon=False)
 
     # Anotação do Líder Final (Opcional, dá um charme data-driven)
-    last_points = df_plot.groupby('driver_full_name').last()['points']
-    for piloto, ponto in last_points.items():
-        # Pega a ultima rodada desse piloto
-        last_race_idx = df_plot[df_plot['driver_full_name'] == piloto]['race_name'].iloc[-1]
+    # Última corrida e pontuação de cada piloto saem de um único groupby (df_plot já está em ordem de rodada),
+    # sem filtrar o DataFrame de novo para cada piloto dentro do loop
+    last_rows = df_plot.groupby('driver_full_name', observed=True)[['race_name', 'points']].last()
+    for piloto, last_race_idx, ponto in last_rows.itertuples(name=None):
         # Plota o texto do lado direito
         # ax.text(x=len(df_plot['race_name'].unique())-1, y=ponto, s=f"{ponto:.0f}", va='center', fontsize=10, fontweight='bold')
         pass # Desativado por padrão para não poluir, ative se quiser os números na ponta da linha
@@ -299,21 +302,40 @@ def plot_chapter_cards(
     """
 
     # --- 1. DADOS ---
-    df_plot = df_dados.copy()
-    df_plot = df_plot[(df_plot['round_id'] >= start_round) & (df_plot['round_id'] <= end_round)]
+    df_plot = df_dados[(df_dados['round_id'] >= start_round) & (df_dados['round_id'] <= end_round)]
 
     if df_plot.empty:
         print(f"Dados vazios para {start_round}-{end_round}")
         return
 
-    ranking = df_plot.groupby('driver_surname')['points_scored_at_round'].sum().sort_values(ascending=True)
-    pilotos = ranking.index.tolist()
+    # Ranking por soma de pontos: codifico os pilotos uma vez e somo com bincount
+    # (pilotos em ordem alfabética, e o argsort estável mantém essa ordem nos empates)
+    codigos_piloto, nomes_pilotos = pd.factorize(df_plot['driver_surname'], sort=True)
+    pontos = df_plot['points_scored_at_round'].to_numpy(dtype=np.float64, na_value=0.0)
+    tem_piloto = codigos_piloto >= 0
+    total_pontos = np.bincount(codigos_piloto[tem_piloto], weights=pontos[tem_piloto], minlength=len(nomes_pilotos))
+    pilotos = nomes_pilotos[np.argsort(total_pontos, kind='stable')].tolist()
     rounds = sorted(df_plot['round_id'].unique())
     race_map = df_plot.set_index('round_id')['race_name'].to_dict()
     
     n_rounds = len(rounds)
     n_drivers = len(pilotos)
 
+    # Resultado de cada piloto em cada rodada num dicionário (piloto, rodada) -> (posição, pontos),
+    # montado uma vez só; no loop dos cards é só consultar, sem filtrar o DataFrame a cada célula.
+    # (se houver linhas repetidas para o mesmo piloto/rodada, vale a primeira, como o .iloc[0] de antes)
+    df_cards = df_plot[['driver_surname', 'round_id', 'finishing_position_at_round', 'points_scored_at_round']]
+    df_cards = df_cards.drop_duplicates(subset=['driver_surname', 'round_id'], keep='first')
+    resultados = {
+        (driver, rd): (pos, pts)
+        for driver, rd, pos, pts in df_cards.itertuples(index=False, name=None)
+    }
+
+    # Nome de cada corrida (header) e cor de cada piloto dependem só da rodada / do piloto,
+    # então já deixo prontos aqui em vez de recalcular dentro do loop
+    nomes_corridas = [race_map.get(rd, "GP").replace("Grand Prix", "GP") for rd in rounds]
+    cores_pilotos = [cores_map.get(driver, '#555555') for driver in pilotos]
+
     # --- 2. CONFIGURAÇÃO VISUAL ---
     alta_densidade = n_rounds >= 8
     
@@ -400,7 +422,7 @@ def plot_chapter_cards(
     # --- 6. PLOTAGEM ---
     for i, driver in enumerate(pilotos):
         y_center = i * cell_h 
-        cor_base = cores_map.get(driver, '#555555')
+        cor_base = cores_pilotos[i]
         
         # NOME PILOTO
         txt = ax.text(-0.6 * cell_w, y_center, driver, 
@@ -410,11 +432,11 @@ def plot_chapter_cards(
 
         for j, rd in enumerate(rounds):
             x_center = j * cell_w
-            row = df_plot[(df_plot['driver_surname'] == driver) & (df_plot['round_id'] == rd)]
+            resultado = resultados.get((driver, rd))
             
-            if not row.empty:
-                pos_raw = row.iloc[0]['finishing_position_at_round']
-                pts_raw = float(row.iloc[0]['points_scored_at_round']) if pd.notna(row.iloc[0]['points_scored_at_round']) else 0.0
+            if resultado is not None:
+                pos_raw, pts_raw = resultado
+                pts_raw = float(pts_raw) if pd.notna(pts_raw) else 0.0
                 
                 txt_pos = f"P{int(pos_raw)}" if pd.notna(pos_raw) else "-"
                 txt_pts = f"+{pts_raw:g}"
@@ -449,7 +471,7 @@ def plot_chapter_cards(
             
             # HEADER (NOME DA CORRIDA)
             if i == n_drivers - 1:
-                nome_corrida = race_map.get(rd, "GP").replace("Grand Prix", "GP")
+                nome_corrida = nomes_corridas[j]
                 y_pos_h = y_center + (cell_h * 0.6) 
                 ha_align = 'left' if header_rotation > 0 else 'center'
                 va_align = 'bottom'
@@ -1,6 +1,8 @@
 import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+from datetime import date
 from dateutil.relativedelta import relativedelta
 from matplotlib.patches import Rectangle
 from typing import Optional, Tuple, List
@@ -13,6 +15,7 @@ def filtrar_evento(
     race_name: Optional[str] = None,
     circuit_name: Optional[str] = None,
     driver_full_name: Optional[str] = None,
+    copy: bool = False,
 ) -> pd.DataFrame:
     """
     Filtra o DataFrame de eventos com base nos critérios fornecidos.
@@ -23,7 +26,9 @@ def filtrar_evento(
     Parâmetros
     ----------
     df : pd.DataFrame
-        DataFrame com dados de eventos.
+        DataFrame com dados de eventos. As colunas de nome podem vir como
+        `category` (convertidas uma vez na carga), o que faz as comparações
+        abaixo rodarem sobre os códigos inteiros em vez de strings.
     year : int, optional
         Ano da corrida.
     race_name : str, optional
@@ -32,27 +37,107 @@ def filtrar_evento(
         Nome do circuito.
     driver_full_name : str, optional
         Nome completo do piloto.
+    copy : bool, default False
+        Se True, retorna uma cópia independente. Use quando for modificar o
+        resultado; para leitura/plot o recorte direto já basta.
 
     Retorna
     -------
     pd.DataFrame
         DataFrame filtrado.
     """
-    df_filtrado = df.copy()
+    # Monto uma única máscara com os critérios informados e indexo o DataFrame uma vez só,
+    # em vez de gerar um DataFrame intermediário a cada filtro.
+    # A máscara é um array numpy, então o `&=` não passa pelo alinhamento de índice do pandas
+    # (a comparação em si continua no pandas, que usa os códigos quando a coluna é `category`).
+    mask = np.ones(len(df), dtype=bool)
 
     if year is not None:
-        df_filtrado = df_filtrado[df_filtrado["year"] == year]
+        mask &= (df["year"] == year).to_numpy()
 
     if race_name is not None:
-        df_filtrado = df_filtrado[df_filtrado["race_name"] == race_name]
+        mask &= (df["race_name"] == race_name).to_numpy()
 
     if circuit_name is not None:
-        df_filtrado = df_filtrado[df_filtrado["circuit_name"] == circuit_name]
+        mask &= (df["circuit_name"] == circuit_name).to_numpy()
 
     if driver_full_name is not None:
-        df_filtrado = df_filtrado[df_filtrado["driver_full_name"] == driver_full_name]
+        mask &= (df["driver_full_name"] == driver_full_name).to_numpy()
 
-    return df_filtrado
+    if copy:
+        return df.loc[mask].copy()
+
+    return df.loc[mask]
+
+
+def otimizar_tipos(
+    df: pd.DataFrame,
+    colunas_categoricas: list[str] = None,
+    colunas_data: list[str] = None,
+    colunas_inteiras: list[str] = None,
+) -> pd.DataFrame:
+    """
+    Converte as colunas mais usadas nos filtros para tipos mais enxutos.
+
+    A ideia é chamar uma única vez, logo depois de carregar os dados do banco,
+    para que as funções de filtro e de cálculo não precisem converter nada:
+    - as colunas numéricas de valores pequenos ('year', número da volta, posições,
+      flags...) viram o menor tipo inteiro que couber (int16 para anos, int8 para
+      posições), o que reduz a memória que os groupbys/shifts têm que percorrer.
+      Colunas com NaN ou com casas decimais continuam como float;
+    - as colunas de nome (e o 'race_status', usado nos filtros de Withdrew/DNF)
+      viram `category`, então comparações e groupbys trabalham sobre códigos
+      inteiros em vez de strings;
+    - as colunas de data viram datetime64, então as contas de idade já
+      recebem datas prontas.
+
+    Colunas que não existirem no DataFrame são ignoradas. Se quem usa o DataFrame
+    agrupa pelas colunas de nome sem `observed=True` (ou concatena strings nelas),
+    passe `colunas_categoricas=[]`: com `category`, esses groupbys geram um grupo
+    para cada categoria, mesmo as que não aparecem no recorte.
+
+    Parâmetros
+    ----------
+    df : pd.DataFrame
+        DataFrame carregado do banco.
+    colunas_categoricas : list[str], optional
+        Colunas de texto a converter para `category`. Se None, usa
+        ['driver_full_name', 'race_name', 'circuit_name', 'constructor_name', 'race_status'].
+    colunas_data : list[str], optional
+        Colunas a converter para datetime64. Se None, usa ['race_date', 'dob'].
+    colunas_inteiras : list[str], optional
+        Colunas numéricas a reduzir para o menor tipo inteiro possível. Se None, usa
+        ['year', 'lap_number', 'lap_time_ms', 'position_on_lap', 'finishing_position',
+        'starting_position', 'is_pit_lap'].
+
+    Retorna
+    -------
+    pd.DataFrame
+        Uma cópia do DataFrame com os tipos convertidos.
+    """
+    # Os defaults ficam aqui (e não na assinatura) para não compartilhar a mesma lista entre chamadas
+    if colunas_categoricas is None:
+        colunas_categoricas = ['driver_full_name', 'race_name', 'circuit_name', 'constructor_name', 'race_status']
+    if colunas_data is None:
+        colunas_data = ['race_date', 'dob']
+    if colunas_inteiras is None:
+        colunas_inteiras = ['year', 'lap_number', 'lap_time_ms', 'position_on_lap', 'finishing_position', 'starting_position', 'is_pit_lap']
+
+    df_out = df.copy()
+
+    for col in colunas_inteiras:
+        if col in df_out.columns:
+            df_out[col] = pd.to_numeric(df_out[col], downcast='integer')
+
+    for col in colunas_categoricas:
+        if col in df_out.columns:
+            df_out[col] = df_out[col].astype('category')
+
+    for col in colunas_data:
+        if col in df_out.columns:
+            df_out[col] = pd.to_datetime(df_out[col])
+
+    return df_out
 
 
 def add_lap_time_ms_column(df: pd.DataFrame, lap_time_col: str = 'lap_time') -> pd.DataFrame:
@@ -72,52 +157,69 @@ def add_lap_time_ms_column(df: pd.DataFrame, lap_time_col: str = 'lap_time') ->
     pd.DataFrame
         O DataFrame com a nova coluna 'lap_time_ms'.
     """
-    df_copy = df.copy()
     # pd.to_timedelta é vetorizado e lida com a série inteira de uma vez.
     # O `errors='coerce'` transforma valores inválidos em NaT (Not a Time),
     # que se tornarão NaN (Not a Number) após o cálculo.
-    timedelta_series = pd.to_timedelta(df_copy[lap_time_col], errors='coerce')
-
-    # Converte para milissegundos
-    df_copy[f'{lap_time_col}_ms'] = timedelta_series.dt.total_seconds() * 1000
+    timedelta_series = pd.to_timedelta(df[lap_time_col], errors='coerce')
 
-    return df_copy
+    # Converte para milissegundos dividindo direto por 1 ms (uma divisão só sobre os int64 internos,
+    # em vez de passar por segundos com o .dt.total_seconds() e multiplicar de volta)
+    return df.assign(**{f'{lap_time_col}_ms': timedelta_series / pd.Timedelta(milliseconds=1)})
 
 def calcula_idade(data_nascimento, data_evento):
-    '''A partir de duas datas, calcula a idade em anos (considerando anos bissextos)'''
-    return (data_evento - data_nascimento).days / 365.25
+    '''
+    A partir de duas datas, calcula a idade em anos (considerando anos bissextos).
+    Aceita tanto datas avulsas quanto colunas/arrays inteiros: com colunas, a conta é vetorizada
+    e sai numa operação só. Datas faltantes (NaT) viram NaN, tanto avulsas quanto nas colunas.
+    '''
+    # Datas avulsas (ex: o apply linha a linha) fazem a conta direto, sem as conversões abaixo
+    if isinstance(data_nascimento, date) and isinstance(data_evento, date):
+        return (data_evento - data_nascimento).days / 365.25
+    # pd.to_datetime lida com escalares e colunas, e deixa o NaT passar (np.asarray não aceita NaT avulso)
+    nascimento = pd.to_datetime(data_nascimento)
+    evento = pd.to_datetime(data_evento)
+    # Dias completos entre as datas (o mesmo que o `.days` de um Timedelta)
+    dias = np.floor((evento - nascimento) / pd.Timedelta(days=1))
+    return dias / 365.25
 
 def gerar_dataset_primeiro_evento(df_events: pd.DataFrame, df_drivers: pd.DataFrame) -> pd.DataFrame:
     '''
     Função para gerar um dataset com o primeiro evento de cada piloto. Vou usar pra extrair a primeira corrida, por exemplo, mas também posso usar pra extrair a primeira vitória, o primeiro pódio, etc.
     Basta eu filtrar previamente o dataset de acordo com o evento desejado (ex: filtrar por finishing_position == 1 pra extrair a primeira vitória, etc).
+    Se `driver_full_name` já vier como `category`, o agrupamento por piloto é feito sobre os códigos inteiros.
+    Pilotos que só têm eventos sem `race_date` (NaT) não entram no resultado.
     '''
 
+    # Analisando o dataset, percebi que existem alguns pilotos muito jovens lá pros anos 60 que constam na base mas nunca largaram de fato (eles tem o status "Withdrew" e vou remover essas entradas)
+    # Removo logo no começo, assim essas linhas não passam pelo sort nem pelo cálculo de idade
+    df_events = df_events[df_events['race_status'] != 'Withdrew']
+
     # Aqui crio um dataset com o primeiro evento de cada piloto:
 
+    colunas = ["driver_id", "driver_full_name", "race_name", "race_date", "year", "circuit_name", "circuit_country", "race_status", "finishing_position", "starting_position", "race_count_for_driver"] # Colunas que eu julgo que possam ser úteis
+
+    # Em vez de ordenar o dataset inteiro, pego direto o índice da menor data de cada piloto
+    # (uma redução por grupo) e só depois seleciono as linhas e colunas que interessam
+    # Linhas sem data ficam de fora, senão o idxmin de um piloto só com NaT devolve NaN e o .loc quebra
+    datas = pd.to_datetime(df_events["race_date"])
+    com_data = datas.notna()
+    idx_primeiro_evento = datas[com_data].groupby(df_events.loc[com_data, "driver_full_name"], sort=False, observed=True).idxmin()
+
     df_first = (
-        df_events.sort_values("race_date")
-        .groupby("driver_full_name")
-        .first()
-        .reset_index()
-        .loc[:, ["driver_id", "driver_full_name", "race_name", "race_date", "year", "circuit_name", "circuit_country", "race_status", "finishing_position", "starting_position", "race_count_for_driver"]] # Colunas que eu julgo que possam ser úteis
+        df_events.loc[idx_primeiro_evento, colunas]
+        .sort_values("driver_full_name") # Ordeno só o resultado (uma linha por piloto), na ordem de antes (por nome do piloto, como as chaves do groupby)
+        .reset_index(drop=True)
     )
 
-    # Adicionando a data de nascimento:
+    # Adicionando a data de nascimento (driver_id é único em df_drivers, então um map resolve sem precisar de merge):
 
-    df_first = pd.merge(
-        df_first,
-        df_drivers[["driver_id", "dob"]],
-        on="driver_id",
-        how="left",
-    )
+    dob_por_piloto = df_drivers.set_index("driver_id")["dob"]
+    df_first["dob"] = df_first["driver_id"].map(dob_por_piloto)
 
     # Calculando a idade do piloto no evento:
 
-    df_first['idade_primeiro_evento'] = df_first.apply(lambda row: calcula_idade(row['dob'], row['race_date']), axis=1)
-
-    # Analisando o dataset, percebi que existem alguns pilotos muito jovens lá pros anos 60 que constam na base mas nunca largaram de fato (eles tem o status "Withdrew" e vou remover essas entradas)
-    df_first = df_first[df_first['race_status'] != 'Withdrew']
+    # `calcula_idade` recebe as colunas inteiras, sem apply linha a linha
+    df_first['idade_primeiro_evento'] = calcula_idade(pd.to_datetime(df_first['dob']), pd.to_datetime(df_first['race_date']))
 
     return df_first
 
@@ -177,7 +279,8 @@ def add_colunas_companheiro_equipe(
         raise ValueError("A coluna 'driver_ref' é obrigatória em `colunas_id_tmate`.")
 
     # --- Etapa 1: Garantir que temos a informação da equipe ---
-    df_com_equipe = df_dados.copy()
+    # (não modifico df_com_equipe, então não preciso copiar o df_dados)
+    df_com_equipe = df_dados
     if coluna_equipe not in df_com_equipe.columns:
         source_df = df_lookup if df_lookup is not None else df_com_equipe
 
@@ -194,7 +297,7 @@ def add_colunas_companheiro_equipe(
             how='left'
         )
 
-    # --- Etapa 2: Preparar dados do companheiro para o "self-merge" ---
+    # --- Etapa 2: Validar as colunas necessárias para o pareamento ---
     chaves_join = chaves_evento + [coluna_equipe]
 
     colunas_companheiro = chaves_join + colunas_id_tmate + metricas
@@ -204,31 +307,51 @@ def add_colunas_companheiro_equipe(
         colunas_faltantes = set(colunas_companheiro) - set(df_com_equipe.columns)
         raise ValueError(f"Colunas faltando no DataFrame: {colunas_faltantes}")
 
-    df_companheiros = df_com_equipe[colunas_companheiro].copy()
-
-    rename_map = {m: f"{m}_tmate" for m in metricas}
-    for col in colunas_id_tmate:
-        rename_map[col] = f"{col}_tmate"
-    df_companheiros = df_companheiros.rename(columns=rename_map)
-
     # --- Etapa 3: Parear pilotos com seus companheiros ---
-    df_pareado = pd.merge(
-        df_com_equipe,
-        df_companheiros,
-        on=chaves_join,
-        how='inner'  # Inner join para focar em equipes com > 1 piloto
-    )
-
-    # Remover comparações do piloto consigo mesmo
-    df_pareado = df_pareado[df_pareado['driver_ref'] != df_pareado['driver_ref_tmate']]
+    # Antes eu fazia um "self-merge" por evento/equipe (todos os pares de pilotos, inclusive o piloto
+    # com ele mesmo) e depois filtrava. Aqui encontro direto a posição da linha do companheiro:
+    # o companheiro é a primeira linha do grupo (evento + equipe) cujo piloto é diferente do piloto da linha.
+    # - se o piloto não é o da primeira linha do grupo, o companheiro é a primeira linha;
+    # - se é, o companheiro é a primeira linha do grupo com outro piloto (se existir).
+    # (dropna=False porque o merge também pareava linhas com chave nula entre si)
+    codigos_grupo = df_com_equipe.groupby(chaves_join, sort=False, observed=True, dropna=False).ngroup().to_numpy()
+    n_grupos = codigos_grupo.max() + 1 if len(codigos_grupo) else 0
+
+    _, primeira_linha_grupo = np.unique(codigos_grupo, return_index=True)
+    pos_primeira = primeira_linha_grupo[codigos_grupo]
+
+    # Comparo os pilotos pelos códigos inteiros do driver_ref (factorize uma vez só), não pelas strings.
+    # Código -1 é driver_ref nulo, que (como no `!=` do pandas) nunca é considerado o mesmo piloto
+    codigos_piloto, _ = pd.factorize(df_com_equipe['driver_ref'], sort=False)
+    outro_piloto = (codigos_piloto != codigos_piloto[pos_primeira]) | (codigos_piloto < 0)
+
+    pos_outro_por_grupo = np.full(n_grupos, -1, dtype=np.int64)
+    linhas_outro_piloto = np.flatnonzero(outro_piloto)
+    grupos_com_outro, primeira_outro = np.unique(codigos_grupo[linhas_outro_piloto], return_index=True)
+    pos_outro_por_grupo[grupos_com_outro] = linhas_outro_piloto[primeira_outro]
+
+    pos_companheiro = np.where(outro_piloto, pos_primeira, pos_outro_por_grupo[codigos_grupo])
 
     # --- Etapa 4: Preparar colunas do companheiro para o join final ---
 
     # Isolar as colunas do companheiro que queremos adicionar
     tmate_cols = [f"{m}_tmate" for m in metricas] + [f"{c}_tmate" for c in colunas_id_tmate]
 
+    # Só as linhas que têm companheiro (equivalente ao inner join de antes)
+    linhas_com_companheiro = np.flatnonzero(pos_companheiro >= 0)
+    df_tmate = df_com_equipe[metricas + colunas_id_tmate].iloc[pos_companheiro[linhas_com_companheiro]]
+    df_tmate.columns = tmate_cols
+
+    df_stats_companheiro = pd.concat(
+        [
+            df_com_equipe[chaves_lookup].iloc[linhas_com_companheiro].reset_index(drop=True),
+            df_tmate.reset_index(drop=True),
+        ],
+        axis=1
+    )
+
     # Manter apenas uma entrada por piloto (em caso de múltiplos companheiros)
-    df_stats_companheiro = df_pareado[chaves_lookup + tmate_cols].drop_duplicates(subset=chaves_lookup)
+    df_stats_companheiro = df_stats_companheiro.drop_duplicates(subset=chaves_lookup)
 
     # --- Etapa 5: Adicionar as colunas ao dataframe original ---
     df_final = pd.merge(
@@ -239,11 +362,11 @@ def add_colunas_companheiro_equipe(
     )
 
     # --- Etapa 6: Calcular a diferença para as métricas ---
-    for m in metricas:
-        col_tmate = f"{m}_tmate"
-        col_diff = f"{m}_diff_tmate"
-        
-        if m in df_final.columns and col_tmate in df_final.columns:
-            df_final[col_diff] = df_final[m] - df_final[col_tmate]
+    # Todas as métricas de uma vez: uma subtração só entre os dois blocos (piloto - companheiro).
+    # A subtração é entre DataFrames (coluna a coluna), então cada diferença mantém o dtype da métrica
+    metricas_diff = [m for m in metricas if m in df_final.columns and f"{m}_tmate" in df_final.columns]
+    if metricas_diff:
+        df_diff = df_final[metricas_diff] - df_final[[f"{m}_tmate" for m in metricas_diff]].set_axis(metricas_diff, axis=1)
+        df_final = df_final.assign(**df_diff.add_suffix('_diff_tmate'))
 
     return df_final
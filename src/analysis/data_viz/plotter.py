@@ -3,8 +3,8 @@ import matplotlib.pyplot as plt
 import numpy as np
 from pyparsing import Dict
 import seaborn as sns
-from dateutil.relativedelta import relativedelta
 from matplotlib.patches import Rectangle, Circle
+from matplotlib.collections import PatchCollection
 from typing import Optional, Tuple, List, Union, Dict
 import os
 
@@ -128,6 +128,31 @@ def graf_radar_padrao(
 
 
 
+def _idade_anos_dias(dob: pd.Series, race_date: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    '''
+    Idade em anos completos e dias desde o último aniversário, na coluna inteira.
+
+    Quem nasceu em 29/02 faz aniversário em 28/02 nos anos não bissextos (como no relativedelta):
+    o dia do aniversário é sempre limitado ao último dia do mês naquele ano.
+    '''
+    race_date = pd.to_datetime(race_date)
+    dob = pd.to_datetime(dob)
+
+    # Aniversário no ano da corrida (só é usado quando o mês da corrida é o mês do aniversário,
+    # então o tamanho do mês da corrida é o tamanho do mês do aniversário naquele ano)
+    dia_aniversario = np.minimum(dob.dt.day, race_date.dt.days_in_month)
+    anos = race_date.dt.year - dob.dt.year - (
+        (race_date.dt.month < dob.dt.month)
+        | ((race_date.dt.month == dob.dt.month) & (race_date.dt.day < dia_aniversario))
+    )
+
+    # Último aniversário, com o mesmo limite do dia ao tamanho do mês naquele ano
+    inicio_mes = pd.to_datetime(pd.DataFrame({"year": dob.dt.year + anos, "month": dob.dt.month, "day": 1}))
+    ultimo_aniversario = inicio_mes + pd.to_timedelta(np.minimum(dob.dt.day, inicio_mes.dt.days_in_month) - 1, unit="D")
+    dias = (race_date - ultimo_aniversario).dt.days
+
+    return anos, dias
+
 def gera_graf_top_10_mais_jovens(
     df_top_10_jovens: pd.DataFrame, 
     titulo: str, 
@@ -140,29 +165,20 @@ def gera_graf_top_10_mais_jovens(
     Função para gerar o gráfico dos 10 pilotos mais jovens.
     '''
     
-    # Função interna para calcular a idade correta em anos e dias
-    def calcula_idade_texto_correto(row):
-        rd = relativedelta(row['race_date'], row['dob'])
-        anos = rd.years
-        # Calcula a diferença em dias desde o último aniversário
-        ultimo_aniversario = row['dob'] + relativedelta(years=anos)
-        dias_restantes = (row['race_date'] - ultimo_aniversario).days
-        return f"{anos} years and {dias_restantes} days"
-
-    # Aplica a função de cálculo de idade correta
-    df_top_10_jovens["idade_texto"] = df_top_10_jovens.apply(
-        calcula_idade_texto_correto, 
-        axis=1
-    )
-
-    df_top_10_jovens["label_y"] = (
-        df_top_10_jovens["driver_full_name"] 
-        + " (" 
-        + df_top_10_jovens["year"].astype(str) 
-        + " · " 
-        + df_top_10_jovens["race_name"] 
-        + ")"
-    )
+    # Idade correta em anos e dias, calculada na coluna inteira
+    anos, dias_restantes = _idade_anos_dias(df_top_10_jovens["dob"], df_top_10_jovens["race_date"])
+
+    df_top_10_jovens["idade_texto"] = [f"{a} years and {d} days" for a, d in zip(anos, dias_restantes)]
+
+    # Monta o label numa passada só (funciona também quando os nomes vêm como `category`)
+    df_top_10_jovens["label_y"] = [
+        f"{nome} ({ano} · {corrida})"
+        for nome, ano, corrida in zip(
+            df_top_10_jovens["driver_full_name"],
+            df_top_10_jovens["year"],
+            df_top_10_jovens["race_name"],
+        )
+    ]
 
     fig, ax = plt.subplots(figsize=(18,9))
 
@@ -178,14 +194,9 @@ def gera_graf_top_10_mais_jovens(
             # Revertido para 'black' (seu original)
             bar.set_edgecolor("black") 
 
-    for bar, label in zip(bars, df_top_10_jovens["idade_texto"]):
-        ax.text(
-            bar.get_width() + 0.05,
-            bar.get_y() + bar.get_height()/2,
-            label,
-            va="center", ha="left"
-            # Fontsize removido para obedecer o .mplstyle
-        )
+    # Um único bar_label em vez de um ax.text por barra
+    # Fontsize removido para obedecer o .mplstyle
+    ax.bar_label(bars, labels=df_top_10_jovens["idade_texto"].tolist(), padding=3)
 
     ax.set_xlim(0, df_top_10_jovens["idade_primeiro_evento"].max() * 1.15)
     ax.set_title(titulo, pad=10) # Fontsize removido
@@ -235,14 +246,29 @@ def graf_top_pilotos(
     """
     
     # --- Dados ---
-    dplot = df.copy().sort_values(by=col_valor, ascending=False).head(top_n).reset_index(drop=True)
+    # nlargest faz uma ordenação parcial (só guarda os top_n), em vez de ordenar o DataFrame inteiro
+    dplot = df.nlargest(top_n, col_valor).reset_index(drop=True)
     if col_detalhe and col_detalhe in dplot.columns:
-        labels = dplot[col_nome] + "  (" + dplot[col_detalhe].astype(str) + ")"
+        labels = [f"{nome}  ({detalhe})" for nome, detalhe in zip(dplot[col_nome], dplot[col_detalhe])]
     else:
-        labels = dplot[col_nome]
+        labels = dplot[col_nome].astype(str).tolist()
 
     valores = dplot[col_valor].astype(float)
+    textos_valores = [valor_format_str.format(val).replace(",", ".") for val in valores]
+    # Barras zeradas ficam sem texto no bar_label: o valor delas é escrito à parte, afastado do eixo
+    idx_zero = np.flatnonzero(valores.to_numpy() == 0)
+    textos_bar_label = ["" if val == 0 else texto for val, texto in zip(valores, textos_valores)]
     nomes = dplot[col_nome]
+    # Posições das barras a destacar, calculadas uma vez para as duas orientações
+    destaque = nomes.astype(str).str.contains(nome_a_destacar, case=False, regex=False).to_numpy()
+    idx_destaque = np.flatnonzero(destaque)
+    # A cor de cada barra já vai pronta para o bar/barh (em vez de um set_color por barra depois)
+    # Sem cor_base, usa a primeira cor do ciclo do estilo ("C0"), como o bar/barh faria num eixo novo
+    cores_barras = np.where(destaque, cor_destaque, cor_base or "C0").tolist()
+    # Espessura das barras: as faixas de destaque são calculadas a partir dela e da posição (centro) de cada barra,
+    # sem consultar o Rectangle de cada barra
+    espessura_barra = 0.6
+    margem_faixa = 0.08
     v_min, v_max = valores.min(), valores.max()
     val_range = v_max - v_min if (v_max - v_min) != 0 else v_max
     if val_range == 0: val_range = abs(v_max) if v_max != 0 else 1 # Evita divisão por zero
@@ -260,8 +286,8 @@ def graf_top_pilotos(
         # =======================================================
         y_pos = range(len(dplot))
         bars = ax.barh(
-            y=list(y_pos), width=valores, color=cor_base,
-            height=0.6, zorder=2,
+            y=list(y_pos), width=valores, color=cores_barras,
+            height=espessura_barra, zorder=2,
         )
         
         xlim_min, xlim_max = (v_min * 1.15, v_max * 1.15)
@@ -270,35 +296,32 @@ def graf_top_pilotos(
         highlight_xlim_min = xlim_min 
 
         # Destaque
-        nome_lower = nome_a_destacar.lower()
-        for i, (bar, nome) in enumerate(zip(bars, nomes)):
-            if nome_lower in str(nome).lower():
-                bar.set_color(cor_destaque)
-                bar.set_alpha(1.0)
-                bar.set_linewidth(1.5)
-                bar.set_edgecolor("black")
-                ax.add_patch(Rectangle(
-                    (highlight_xlim_min, bar.get_y()-0.08), xlim_max - highlight_xlim_min,
-                    bar.get_height()+0.16,
-                    facecolor=cor_destaque, alpha=0.06, edgecolor="none", zorder=1
-                ))
+        # As faixas de fundo vão todas numa única PatchCollection (um artista só, em vez de um por barra)
+        faixas_destaque = []
+        for i in idx_destaque:
+            bar = bars[i]
+            bar.set_linewidth(1.5)
+            bar.set_edgecolor("black")
+            faixas_destaque.append(Rectangle(
+                (highlight_xlim_min, i - espessura_barra/2 - margem_faixa), xlim_max - highlight_xlim_min,
+                espessura_barra + 2*margem_faixa,
+            ))
+        if faixas_destaque:
+            ax.add_collection(PatchCollection(
+                faixas_destaque, facecolor=cor_destaque, alpha=0.06, edgecolor="none", zorder=1
+            ))
         
         # Posição dos Ticks (sem labels ainda)
         ax.set_yticks(list(y_pos))
         ax.invert_yaxis()  # #1 no topo
 
         # Valores (números) na ponta da barra
-        for bar, val in zip(bars, valores):
-            ha = 'left' if val >= 0 else 'right'
-            offset_text = val_range * 0.01 
-            x_pos = bar.get_width() + offset_text if val >= 0 else bar.get_width() - offset_text
-            if val == 0:
-                x_pos = offset_text
-                ha = 'left'
+        # O bar_label já alinha à direita as barras negativas e à esquerda as positivas
+        ax.bar_label(bars, labels=textos_bar_label, padding=3, zorder=3)
+        for i in idx_zero:
             ax.text(
-                x_pos, bar.get_y() + bar.get_height()/2,
-                valor_format_str.format(val).replace(",", "."),
-                va="center", ha=ha, zorder=3
+                val_range * 0.01, i, textos_valores[i],
+                va="center", ha="left", zorder=3
             )
         
         # Estética
@@ -325,7 +348,7 @@ def graf_top_pilotos(
                 # Posiciona o texto em coordenadas de eixo (X) e dados (Y)
                 # -0.01 significa 1% à esquerda da área de plotagem
                 ax.text(
-                    -0.03, y, str(label_text) + " ", # Espaço para padding
+                    -0.03, y, label_text + " ", # Espaço para padding
                     transform=trans,
                     ha='right',  # Alinha o final do texto à posição
                     va='center'
@@ -333,7 +356,7 @@ def graf_top_pilotos(
         else:
             # Comportamento original para valores apenas positivos
             ax.spines["left"].set_visible(False)
-            ax.set_yticklabels([str(lbl) for lbl in labels]) # Nomes no lugar padrão
+            ax.set_yticklabels(labels) # Nomes no lugar padrão
 
     else:
         # =======================================================
@@ -341,8 +364,8 @@ def graf_top_pilotos(
         # =======================================================
         x_pos = range(len(dplot))
         bars = ax.bar(
-            x=list(x_pos), height=valores, color=cor_base,
-            width=0.6, zorder=2,
+            x=list(x_pos), height=valores, color=cores_barras,
+            width=espessura_barra, zorder=2,
         )
 
         ylim_min, ylim_max = (v_min * 1.2, v_max * 1.2)
@@ -351,31 +374,28 @@ def graf_top_pilotos(
         ax.set_ylim(ylim_min, ylim_max)
 
         # Destaque
-        nome_lower = nome_a_destacar.lower()
-        for i, (bar, nome) in enumerate(zip(bars, nomes)):
-            if nome_lower in str(nome).lower():
-                bar.set_color(cor_destaque)
-                bar.set_alpha(1.0)
-                bar.set_linewidth(1.5)
-                bar.set_edgecolor("black")
-                ax.add_patch(Rectangle(
-                    (bar.get_x()-0.08, ylim_min), bar.get_width()+0.16,
-                    ylim_max - ylim_min,
-                    facecolor=cor_destaque, alpha=0.06, edgecolor="none", zorder=1
-                ))
+        # As faixas de fundo vão todas numa única PatchCollection (um artista só, em vez de um por barra)
+        faixas_destaque = []
+        for i in idx_destaque:
+            bar = bars[i]
+            bar.set_linewidth(1.5)
+            bar.set_edgecolor("black")
+            faixas_destaque.append(Rectangle(
+                (i - espessura_barra/2 - margem_faixa, ylim_min), espessura_barra + 2*margem_faixa,
+                ylim_max - ylim_min,
+            ))
+        if faixas_destaque:
+            ax.add_collection(PatchCollection(
+                faixas_destaque, facecolor=cor_destaque, alpha=0.06, edgecolor="none", zorder=1
+            ))
 
         # Valores (números) acima/abaixo das colunas
-        for bar, val in zip(bars, valores):
-            va = 'bottom' if val >= 0 else 'top'
-            offset = val_range * 0.01
-            y_pos = bar.get_height() + offset if val >= 0 else bar.get_height() - offset
-            if val == 0:
-                y_pos = offset
-                va = 'bottom'
+        # O bar_label já coloca abaixo as colunas negativas e acima as positivas
+        ax.bar_label(bars, labels=textos_bar_label, padding=3, zorder=3)
+        for i in idx_zero:
             ax.text(
-                bar.get_x() + bar.get_width()/2, y_pos,
-                valor_format_str.format(val).replace(",", "."),
-                ha="center", va=va, zorder=3
+                i, val_range * 0.01, textos_valores[i],
+                ha="center", va="bottom", zorder=3
             )
 
         # Estética
@@ -398,7 +418,7 @@ def graf_top_pilotos(
             
             # Aplica os Nomes (labels) com alinhamento e rotação para o TOPO
             ax.set_xticklabels(
-                [str(lbl) for lbl in labels], 
+                labels, 
                 rotation=20, 
                 ha="left"  # Alinha o *começo* do nome no tick (para "fora")
             )
@@ -410,7 +430,7 @@ def graf_top_pilotos(
             # Ticks e Nomes EMBAIXO (padrão)
             ax.xaxis.set_ticks_position("bottom") 
             ax.set_xticklabels(
-                [str(lbl) for lbl in labels], 
+                labels, 
                 rotation=20, 
                 ha="right" # Alinha o *fim* do nome no tick (para "fora")
             )
@@ -425,7 +445,7 @@ def graf_top_pilotos(
     # Ajuste de margem pós-tight_layout (necessário para nomes rotacionados)
     if not orientation.lower().startswith("h"): # Se for Vertical
         try:
-            max_label_len = max([len(str(l)) for l in labels])
+            max_label_len = max(len(l) for l in labels)
         except ValueError:
             max_label_len = 0
         
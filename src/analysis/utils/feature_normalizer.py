@@ -1,6 +1,7 @@
 from typing import Tuple, Union, Optional
 import pandas as pd
 import numpy as np
+import warnings
 
 class FeatureNormalizer:
     """
@@ -119,3 +120,76 @@ class FeatureNormalizer:
         # We apply min-max on the Z-scored (and potentially clipped) data
         # to ensure the final output strictly adheres to target_range.
         return cls.min_max(data_to_scale, target_range=target_range)
+
+    @classmethod
+    def robust_normalize_frame(
+        cls,
+        df: pd.DataFrame,
+        target_range: Tuple[float, float] = (0, 1),
+        clip_outliers_sigma: Optional[float] = None,
+        lower_is_better: bool = False
+    ) -> pd.DataFrame:
+        """
+        Column-wise version of `robust_normalize` for a whole DataFrame.
+
+        Every column is normalized independently with the same rules as `robust_normalize`
+        (including the constant-column fallbacks of `z_score` and `min_max`), but the
+        statistics for all columns are computed in one vectorized pass instead of one
+        Python call per column.
+
+        Args:
+            df (pd.DataFrame): The input data, one feature per column.
+            target_range (Tuple[float, float]): The desired output range.
+            clip_outliers_sigma (Optional[float]): Same as in `robust_normalize`.
+            lower_is_better (bool): Same as in `robust_normalize`, applied to every column.
+
+        Returns:
+            pd.DataFrame: The normalized frame, with the same index and columns as `df`.
+        """
+        if df.empty:
+            return df
+
+        target_min, target_max = target_range
+        values = df.to_numpy(dtype=np.float64)
+
+        # 0. Handle Directionality
+        if lower_is_better:
+            values = -values
+
+        normalized = _robust_normalize_2d(values, target_min, target_max, clip_outliers_sigma)
+        return pd.DataFrame(normalized, index=df.index, columns=df.columns)
+
+
+def _robust_normalize_2d(
+    values: np.ndarray,
+    target_min: float,
+    target_max: float,
+    clip_outliers_sigma: Optional[float] = None
+) -> np.ndarray:
+    """
+    NumPy kernel behind `FeatureNormalizer.robust_normalize_frame`.
+
+    Works column-wise on a 2-D float array with the NaN semantics of pandas
+    (NaNs are skipped by the statistics and kept in the output).
+    """
+    # Columns with fewer than two values or only NaNs produce NaN statistics, like pandas;
+    # the matching RuntimeWarnings from NumPy are just noise here.
+    with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+        warnings.simplefilter('ignore', RuntimeWarning)
+
+        # 1. Z-Score Standardization (constant columns become 0.0, as in z_score)
+        std = np.nanstd(values, axis=0, ddof=1)
+        z_scored = (values - np.nanmean(values, axis=0)) / std
+        z_scored[:, std == 0] = 0.0
+
+        # 2. Outlier Clipping
+        if clip_outliers_sigma is not None:
+            z_scored = np.clip(z_scored, -clip_outliers_sigma, clip_outliers_sigma)
+
+        # 3. Min-Max Scaling (single-valued columns collapse to target_min, as in min_max)
+        col_min = np.nanmin(z_scored, axis=0)
+        col_max = np.nanmax(z_scored, axis=0)
+        scaled = (z_scored - col_min) / (col_max - col_min) * (target_max - target_min) + target_min
+        scaled[:, col_max == col_min] = target_min
+
+    return scaled
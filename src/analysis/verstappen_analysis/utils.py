@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from dateutil.relativedelta import relativedelta
@@ -17,6 +18,23 @@ else:
     print(f"Aviso: Arquivo de estilo não encontrado em '{style_path}'. Usando o estilo padrão do Matplotlib.")
 
 
+def _codificar_chaves(chaves: List[pd.Series]) -> np.ndarray:
+    """
+    Junta várias colunas-chave num único código inteiro (int64) por combinação.
+
+    Agrupar por um array de inteiros é bem mais barato do que agrupar por várias colunas
+    (tuplas de objetos/strings). Linhas com alguma chave nula recebem o código -1.
+    """
+    codigos = np.zeros(len(chaves[0]), dtype=np.int64)
+    chave_nula = np.zeros(len(chaves[0]), dtype=bool)
+    for chave in chaves:
+        codigos_chave, valores_unicos = pd.factorize(chave, sort=False)
+        chave_nula |= codigos_chave < 0
+        codigos = codigos * len(valores_unicos) + codigos_chave
+    codigos[chave_nula] = -1
+    return codigos
+
+
 def identificar_voltas_safety_car(
     df_laps: pd.DataFrame,
     threshold_percent: float = 1.20,
@@ -50,30 +68,48 @@ def identificar_voltas_safety_car(
     pd.DataFrame
         Uma cópia do DataFrame original com a nova coluna 'is_safety_car_lap'.
     """
-    df_out = df_laps.copy()
-
-    # 1. Filtrar voltas que não representam ritmo de corrida (pit stops, 1ª volta)
-    df_racing_laps = df_out.query("is_pit_lap == 0 and lap_number > 1").copy()
+    # Não copio o DataFrame no começo: todas as etapas só leem df_laps e guardam os
+    # resultados em variáveis; a cópia acontece uma única vez, no assign final.
+    # As chaves de corrida (e de corrida + piloto) viram um único código int64, calculado uma vez,
+    # para os groupbys abaixo não precisarem fazer hash de várias colunas/strings a cada chamada
+    race_keys = [df_laps[c] for c in group_cols]
+    race_codes = _codificar_chaves(race_keys)
+    driver_codes = _codificar_chaves(race_keys + [df_laps['driver_full_name']])
+
+    # 1. Desconsiderar voltas que não representam ritmo de corrida (pit stops, 1ª volta)
+    # Em vez de filtrar numa cópia, só "apago" o tempo dessas voltas (NaN), que a mediana ignora
+    # (linhas sem corrida identificada, código -1, também ficam sem ritmo base, como no groupby por colunas)
+    is_racing_lap = (df_laps['is_pit_lap'] == 0) & (df_laps['lap_number'] > 1) & (race_codes >= 0)
+    lap_time_for_pace = df_laps['lap_time_ms'].where(is_racing_lap)
 
     # 2. Calcular o ritmo de corrida base (mediana) PARA CADA CORRIDA
-    df_racing_laps['baseline_pace'] = df_racing_laps.groupby(group_cols)['lap_time_ms'].transform('median')
-
-    # Mapear o ritmo base de volta para o DataFrame completo
-    df_out = df_out.merge(df_racing_laps[['baseline_pace']], left_index=True, right_index=True, how='left')
+    # O transform já devolve o ritmo alinhado linha a linha, sem precisar de merge.
+    # Como o resultado volta alinhado ao índice original, não preciso ordenar os grupos (sort=False).
+    # As voltas que ficaram de fora (pit/1ª volta) ficam sem ritmo base, como antes
+    baseline_pace = lap_time_for_pace.groupby(race_codes, sort=False).transform('median').where(is_racing_lap)
 
     # Valor que vou usar como corte:
-    df_out['baseline_pace_plus_threshold'] = df_out['baseline_pace'] * threshold_percent
+    baseline_pace_plus_threshold = baseline_pace * threshold_percent
 
     # 5. Identificar se o piloto perdeu posições na volta seguinte
     # Isso ajuda a diferenciar uma volta lenta por SC de uma rodada/erro individual.
     # Agrupamos por corrida e piloto para fazer o shift corretamente.
-    driver_group_cols = group_cols + ['driver_full_name']
-    df_out['next_lap_position'] = df_out.groupby(driver_group_cols)['position_on_lap'].shift(-1)
+    # Daqui pra frente trabalho com arrays numpy: cada etapa é só uma operação vetorizada,
+    # sem criar uma Series (ou um DataFrame inteiro via .assign) a cada passo.
+    position_on_lap = df_laps['position_on_lap'].to_numpy(dtype=float, na_value=np.nan)
+    next_lap_position = (
+        df_laps['position_on_lap'].groupby(driver_codes, sort=False).shift(-1).to_numpy(dtype=float, na_value=np.nan)
+    )
+    next_lap_position[driver_codes < 0] = np.nan
     # A condição é verdadeira se a posição piorou (ex: de P5 para P8)
-    lost_position = df_out['next_lap_position'] > df_out['position_on_lap'] + 3 # Coloco uma tolerância de 3 posições aqui (a ideia é que, se o piloto cometeu um erro grave que o fez perder muito tempo, ele vai perder masi do que isso em posições)
+    lost_position = next_lap_position > position_on_lap + 3 # Coloco uma tolerância de 3 posições aqui (a ideia é que, se o piloto cometeu um erro grave que o fez perder muito tempo, ele vai perder masi do que isso em posições)
 
     # 6. Identificar as voltas candidatas a SC (significativamente mais lentas)
-    is_slow_lap = df_out['lap_time_ms'] > df_out['baseline_pace_plus_threshold']
+    # (comparações com NaN dão False, então voltas sem ritmo base nunca são lentas)
+    is_slow_lap = (
+        df_laps['lap_time_ms'].to_numpy(dtype=float, na_value=np.nan)
+        > baseline_pace_plus_threshold.to_numpy(dtype=float, na_value=np.nan)
+    )
 
     # 7. Uma volta é considerada de SC se for lenta E o piloto NÃO perdeu posição.
     # Isso filtra os erros individuais. Pq se for lento, e o piloto perdeu posições, então entendemos que ele pode ter errado e, nesse caso, a volta é mantida
@@ -81,16 +117,17 @@ def identificar_voltas_safety_car(
 
     # 8. Identificar a volta ANTERIOR à volta de SC, por corrida
     # Usamos groupby + shift para "olhar" para a volta seguinte dentro de cada grupo de corrida
-    is_lap_before_sc = df_out.assign(_is_sc_lap=is_sc_lap).groupby(group_cols)['_is_sc_lap'].shift(-1).fillna(False)
+    # (o .eq(True) trata como False tanto a última volta de cada grupo quanto linhas sem grupo)
+    is_lap_before_sc = (
+        pd.Series(is_sc_lap, index=df_laps.index).groupby(race_codes, sort=False).shift(-1).eq(True).to_numpy()
+    )
 
     # 9. A volta é considerada de SC se for a volta lenta (filtrada) OU a volta anterior a ela
-    df_out['is_safety_car_lap'] = is_sc_lap | is_lap_before_sc
-
-    # Limpeza final
-    df_out = df_out.drop(columns=['baseline_pace', 'next_lap_position'], errors='ignore')
-    df_out['is_safety_car_lap'] = df_out['is_safety_car_lap'].fillna(False) # Garante que não haja NaNs
-
-    return df_out
+    # O assign devolve a cópia do DataFrame original já com as colunas novas
+    return df_laps.assign(
+        baseline_pace_plus_threshold=baseline_pace_plus_threshold,
+        is_safety_car_lap=is_sc_lap | is_lap_before_sc,
+    )
 
 
 def filtrar_voltas_para_analise(
@@ -127,25 +164,29 @@ def filtrar_voltas_para_analise(
     pd.DataFrame
         DataFrame com os tempos de volta filtrados.
     """
-    df_filtrado = df.copy()
+    # Valido as colunas obrigatórias antes de qualquer processamento
+    if remove_pit_laps and 'is_pit_lap' not in df.columns:
+        raise ValueError("A coluna 'is_pit_lap' é necessária para remover voltas de pit stop.")
+
+    if remove_dnf_races and 'race_status' not in df.columns:
+        raise ValueError("A coluna 'race_status' é necessária para remover corridas não finalizadas (DNF).")
+
+    # Uma única máscara com todos os critérios, e o DataFrame é indexado uma vez só
+    mask = np.ones(len(df), dtype=bool)
 
     if remove_pit_laps:
-        if 'is_pit_lap' not in df_filtrado.columns:
-            raise ValueError("A coluna 'is_pit_lap' é necessária para remover voltas de pit stop.")
-        df_filtrado = df_filtrado.query("is_pit_lap == 0")
+        mask &= (df['is_pit_lap'] == 0).to_numpy()
 
     if remove_first_lap:
-        df_filtrado = df_filtrado.query("lap_number > 1")
+        mask &= (df['lap_number'] > 1).to_numpy()
 
     if remove_sc_laps:
-        df_filtrado = df_filtrado.query("is_safety_car_lap == False")
+        mask &= ~df['is_safety_car_lap'].to_numpy(dtype=bool)
 
     if remove_dnf_races:
-        if 'race_status' not in df_filtrado.columns:
-            raise ValueError("A coluna 'race_status' é necessária para remover corridas não finalizadas (DNF).")
-        df_filtrado = df_filtrado.query("race_status == 0") # 0 = Finished
+        mask &= (df['race_status'] == 0).to_numpy() # 0 = Finished
 
-    return df_filtrado
+    return df.loc[mask]
 
 def comparar_consistencia_pilotos_hist(
     df_consistencia: pd.DataFrame,
@@ -183,14 +224,23 @@ def comparar_consistencia_pilotos_hist(
         print("A lista `pilotos_a_comparar` está vazia. Nenhum gráfico para gerar.")
         return
 
+    # Separo o DataFrame por piloto uma vez só; dentro do loop é só consultar o dicionário
+    # (em vez de varrer o DataFrame inteiro várias vezes a cada comparação)
+    dados_por_piloto = dict(tuple(df_consistencia.groupby('driver_full_name', sort=False, observed=True)))
+    df_vazio = df_consistencia.iloc[0:0]
+    df_base = dados_por_piloto.get(piloto_base, df_vazio)
+    # O que depende só do piloto base é calculado uma vez, fora do loop
+    n_corridas_base = len(df_base)
+    media_base = df_base[metrica].mean()
+
     for piloto_comparado in pilotos_a_comparar:
         if figsize:
             fig, ax = plt.subplots(figsize=figsize)
         else:
             fig, ax = plt.subplots()
 
-        pilotos_no_grafico = [piloto_base, piloto_comparado]
-        df_plot = df_consistencia[df_consistencia['driver_full_name'].isin(pilotos_no_grafico)]
+        df_comparado = dados_por_piloto.get(piloto_comparado, df_vazio)
+        df_plot = pd.concat([df_base, df_comparado])
 
         # Define uma paleta de cores fixa para garantir consistência
         cor_base = "#FF7009"      # Laranja para o piloto base (Verstappen)
@@ -201,15 +251,13 @@ def comparar_consistencia_pilotos_hist(
         hue_order = [piloto_base, piloto_comparado]
 
         # Calcula o número de corridas (amostra) para cada piloto
-        n_corridas_base = len(df_plot[df_plot['driver_full_name'] == piloto_base])
-        n_corridas_comparado = len(df_plot[df_plot['driver_full_name'] == piloto_comparado])
+        n_corridas_comparado = len(df_comparado)
 
         # Plot do histograma e da curva de densidade (KDE)
         sns.histplot(data=df_plot, x=metrica, hue='driver_full_name', bins=bins, kde=True, ax=ax, palette=palette, hue_order=hue_order)
 
         # Adiciona linhas verticais para a média de cada piloto
-        media_base = df_plot[df_plot['driver_full_name'] == piloto_base][metrica].mean()
-        media_comparado = df_plot[df_plot['driver_full_name'] == piloto_comparado][metrica].mean()
+        media_comparado = df_comparado[metrica].mean()
 
         ax.axvline(media_base, color=cor_base, linestyle='--', label=f'Média {piloto_base.split(" ")[-1]}: {media_base:.2f}')
         ax.axvline(media_comparado, color=cor_comparado, linestyle='--', label=f'Média {piloto_comparado.split(" ")[-1]}: {media_comparado:.2f}')
@@ -277,39 +325,32 @@ def get_final_quali_session(
         com sua posição final de qualificação.
     """
     
-    # Copia para evitar SettingWithCopyWarning
-    df_proc = df_quali_all.copy()
-
     # --- Passo 1: Mapear a Prioridade dos Segmentos ---
-    # Define qual sessão tem prioridade (Q3 é a mais alta)
-    priority_map = {
-        'Q1': 1,
-        'Q2': 2,
-        'Q3': 3,
-    }
-
-    # Cria a coluna de prioridade
-    df_proc['segment_priority'] = df_proc[col_session].map(priority_map)
-    
-    # Remove linhas que não são de qualificação (ex: FP1, 'R')
-    df_proc = df_proc[df_proc['segment_priority'].notna()].copy()
+    # Define qual sessão tem prioridade (Q3 é a mais alta): a ordem das categorias é a prioridade,
+    # e os códigos do Categorical (int8) já são a coluna de prioridade, sem um lookup de dicionário por linha
+    segmentos_quali = ['Q1', 'Q2', 'Q3']
+
+    # Prioridade de cada linha (sessões fora da lista, ex: FP1, 'R', ficam com código -1)
+    segment_priority = pd.Categorical(df_quali_all[col_session], categories=segmentos_quali, ordered=True).codes
+
+    # Remove linhas que não são de qualificação (ex: FP1, 'R') e, numa máscara só,
+    # as linhas com evento/piloto nulo (que ficavam fora do groupby de antes).
+    # A coluna entra via assign, então o recorte não precisa de .copy() para evitar o SettingWithCopyWarning
+    mask = (segment_priority >= 0) & df_quali_all[[col_event, col_driver]].notna().all(axis=1).to_numpy()
+    df_proc = df_quali_all.loc[mask].assign(segment_priority=segment_priority[mask])
+
+    # --- Passo 2 e 3: Selecionar a linha do segmento mais alto de cada piloto/evento ---
+    # Em vez de um idxmax por grupo, ordeno uma vez (evento, piloto, prioridade decrescente) e
+    # fico com a primeira linha de cada par evento/piloto.
+    # A ordenação de várias colunas é estável, então em caso de empate fica a primeira linha
+    # do DataFrame original (como no idxmax), e o resultado sai ordenado por evento/piloto (como no groupby).
+    # Sem dados de quali válidos, o mesmo caminho devolve um DataFrame vazio já com 'final_quali_position'.
+    df_final_results = (
+        df_proc
+        .sort_values([col_event, col_driver, 'segment_priority'], ascending=[True, True, False])
+        .drop_duplicates(subset=[col_event, col_driver], keep='first')
+    )
 
-    # --- Passo 2: Encontrar o Índice (idx) da Posição Final ---
-    
-    # Agrupa por evento e piloto
-    groups = df_proc.groupby([col_event, col_driver])
-    
-    try:
-        idx_final_position = groups['segment_priority'].idxmax()
-    except ValueError as e:
-        print(f"Aviso: Não foi possível processar os grupos. {e}")
-        # Retorna um DataFrame vazio se não houver dados de quali válidos
-        return pd.DataFrame(columns=df_quali_all.columns)
-
-    # --- Passo 3: Selecionar as Linhas Finais ---
-    # Usa .loc[] para selecionar apenas as linhas com os índices que encontramos
-    df_final_results = df_proc.loc[idx_final_position].copy()
-    
     # --- Limpeza e Retorno ---
     # Remove a coluna temporária
     df_final_results = df_final_results.drop(columns=['segment_priority'])
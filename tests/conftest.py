@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Os notebooks importam os módulos a partir da raiz do repositório (ex: `from src.analysis...`)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
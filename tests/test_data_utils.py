@@ -0,0 +1,99 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.data.utils import (
+    add_colunas_companheiro_equipe,
+    calcula_idade,
+    gerar_dataset_primeiro_evento,
+    otimizar_tipos,
+)
+
+
+def test_calcula_idade_escalar():
+    idade = calcula_idade(pd.Timestamp('1997-09-30'), pd.Timestamp('2015-03-15'))
+    assert idade == (pd.Timestamp('2015-03-15') - pd.Timestamp('1997-09-30')).days / 365.25
+    assert calcula_idade(date(1997, 9, 30), date(2015, 3, 15)) == idade
+
+
+def test_calcula_idade_nat_escalar_vira_nan():
+    # Piloto sem data de nascimento (left merge) não pode quebrar o apply linha a linha dos notebooks
+    assert np.isnan(calcula_idade(pd.NaT, pd.Timestamp('2015-03-15')))
+    assert np.isnan(calcula_idade(pd.Timestamp('1997-09-30'), pd.NaT))
+
+
+def test_calcula_idade_colunas():
+    dob = pd.Series(pd.to_datetime(['1997-09-30', None]))
+    race_date = pd.Series(pd.to_datetime(['2015-03-15', '2015-03-15']))
+    idades = calcula_idade(dob, race_date)
+    assert idades.iloc[0] == calcula_idade(dob.iloc[0], race_date.iloc[0])
+    assert np.isnan(idades.iloc[1])
+
+
+def test_add_colunas_companheiro_equipe_mantem_dtypes():
+    df = pd.DataFrame({
+        'round_id': [1, 1, 1, 1],
+        'driver_ref': ['max', 'checo', 'lando', 'oscar'],
+        'constructor_name': ['Red Bull', 'Red Bull', 'McLaren', 'McLaren'],
+        'position': pd.Series([1, 4, 2, 3], dtype='int64'),
+        'points': pd.Series([25, 12, 18, None], dtype='Int64'),
+    })
+
+    df_final = add_colunas_companheiro_equipe(df, metricas=['position', 'points'])
+
+    assert df_final['driver_ref_tmate'].tolist() == ['checo', 'max', 'oscar', 'lando']
+    assert df_final['position_diff_tmate'].dtype == 'int64'
+    assert df_final['points_diff_tmate'].dtype == 'Int64'
+    assert df_final['position_diff_tmate'].tolist() == [-3, 3, -1, 1]
+    assert df_final['points_diff_tmate'].iloc[:2].tolist() == [13, -13]
+    assert df_final['points_diff_tmate'].iloc[2:].isna().all()
+
+
+def test_gerar_dataset_primeiro_evento_piloto_so_com_nat():
+    df_events = pd.DataFrame({
+        'driver_id': [1, 1, 2, 2],
+        'driver_full_name': ['Max Verstappen', 'Max Verstappen', 'Sem Data', 'Sem Data'],
+        'race_name': ['Brazil', 'Australia', 'Monaco', 'Italy'],
+        'race_date': pd.to_datetime(['2015-11-15', '2015-03-15', None, None]),
+        'year': [2015, 2015, 1960, 1960],
+        'circuit_name': ['Interlagos', 'Albert Park', 'Monaco', 'Monza'],
+        'circuit_country': ['Brazil', 'Australia', 'Monaco', 'Italy'],
+        'race_status': ['Finished', 'Retired', 'Finished', 'Finished'],
+        'finishing_position': [4, None, 10, 8],
+        'starting_position': [6, 12, 15, 14],
+        'race_count_for_driver': [19, 1, 1, 2],
+    })
+    df_drivers = pd.DataFrame({
+        'driver_id': [1, 2],
+        'dob': pd.to_datetime(['1997-09-30', '1935-01-01']),
+    })
+
+    df_first = gerar_dataset_primeiro_evento(df_events, df_drivers)
+
+    assert df_first['driver_full_name'].tolist() == ['Max Verstappen']
+    assert df_first['race_name'].tolist() == ['Australia']
+
+
+def test_otimizar_tipos():
+    df = pd.DataFrame({
+        'year': [2015, 2024],
+        'race_date': ['2015-03-15', '2024-03-02'],
+        'driver_full_name': ['Max Verstappen', 'Max Verstappen'],
+        'finishing_position': [None, 1],
+        'lap_number': [1, 57],
+    })
+
+    df_out = otimizar_tipos(df)
+
+    assert df_out['year'].dtype == 'int16'
+    assert df_out['lap_number'].dtype == 'int8'
+    # Com NaN a coluna continua float
+    assert df_out['finishing_position'].dtype == 'float64'
+    assert df_out['race_date'].dtype == 'datetime64[ns]'
+    assert df_out['driver_full_name'].dtype == 'category'
+    # O DataFrame original não muda
+    assert df['year'].dtype == 'int64'
+
+    df_sem_categorias = otimizar_tipos(df, colunas_categoricas=[])
+    assert df_sem_categorias['driver_full_name'].dtype == object
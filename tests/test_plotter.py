@@ -0,0 +1,56 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import pandas as pd
+from matplotlib.colors import to_hex
+
+from src.analysis.data_viz.plotter import _idade_anos_dias, graf_top_pilotos
+
+
+def test_idade_anos_dias():
+    anos, dias = _idade_anos_dias(pd.Series(['1997-09-30']), pd.Series(['2015-03-15']))
+    assert (anos.iloc[0], dias.iloc[0]) == (17, 166)
+
+
+def test_idade_anos_dias_nascido_em_29_de_fevereiro():
+    # Em ano não bissexto o aniversário de quem nasceu em 29/02 é 28/02 (como no relativedelta)
+    dob = pd.Series(['2000-02-29', '2000-02-29', '2000-02-29'])
+    race_date = pd.Series(['2001-02-27', '2001-02-28', '2004-02-29'])
+    anos, dias = _idade_anos_dias(dob, race_date)
+    assert anos.tolist() == [0, 1, 4]
+    assert dias.tolist() == [364, 0, 0]
+
+
+def test_graf_top_pilotos_com_padroes(monkeypatch):
+    monkeypatch.setattr(plt, "show", lambda: None)
+    df = pd.DataFrame({
+        "driver_full_name": ["Max Verstappen", "Lewis Hamilton", "Charles Leclerc"],
+        "qtd": [40, 30, 20],
+    })
+    for orientation in ("horizontal", "vertical"):
+        graf_top_pilotos(df, orientation=orientation)
+        ax = plt.gcf().axes[0]
+        cores = [to_hex(bar.get_facecolor()) for bar in ax.patches]
+        assert cores == [to_hex("#FF7009"), to_hex("C0"), to_hex("C0")]
+        plt.close("all")
+
+
+def test_graf_top_pilotos_valor_zero_afastado_do_eixo(monkeypatch):
+    monkeypatch.setattr(plt, "show", lambda: None)
+    df = pd.DataFrame({
+        "driver_full_name": ["Max Verstappen", "Lewis Hamilton", "Charles Leclerc"],
+        "qtd": [10, 0, -10],
+    })
+    for orientation, pos, alinhamento in (("horizontal", (0.2, 1), "left"), ("vertical", (1, 0.2), "bottom")):
+        graf_top_pilotos(df, orientation=orientation)
+        ax = plt.gcf().axes[0]
+        textos_zero = [t for t in ax.texts if t.get_text() == "0"]
+        assert len(textos_zero) == 1
+        assert textos_zero[0].get_position() == pos
+        if orientation == "horizontal":
+            assert textos_zero[0].get_horizontalalignment() == alinhamento
+        else:
+            assert textos_zero[0].get_verticalalignment() == alinhamento
+        plt.close("all")
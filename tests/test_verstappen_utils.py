@@ -0,0 +1,32 @@
+import pandas as pd
+
+from src.analysis.verstappen_analysis.utils import get_final_quali_session
+
+
+def test_get_final_quali_session_fica_com_o_segmento_mais_alto():
+    df = pd.DataFrame({
+        'round_id': [1, 1, 1, 1],
+        'driver_id': [33, 33, 33, 44],
+        'session_type': ['Q1', 'Q3', 'Q2', 'Q1'],
+        'position': [3, 1, 2, 16],
+    })
+
+    df_final = get_final_quali_session(df)
+
+    assert df_final['driver_id'].tolist() == [33, 44]
+    assert df_final['final_quali_position'].tolist() == [1, 16]
+
+
+def test_get_final_quali_session_sem_quali_valida():
+    df = pd.DataFrame({
+        'round_id': [1, 1],
+        'driver_id': [33, 44],
+        'session_type': ['FP1', 'R'],
+        'position': [1, 2],
+    })
+
+    df_final = get_final_quali_session(df)
+
+    assert df_final.empty
+    assert 'final_quali_position' in df_final.columns
+    assert 'position' not in df_final.columns